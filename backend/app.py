@@ -1,22 +1,39 @@
+import asyncio
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-from stockSentiment import get_stock_sentiment
-from stockData import get_stock_data
-from stockGraph import get_graph_data
-from predictStock import train_or_predict
+from stockSentiment import get_stock_sentiment, score_cache, warm_up as warm_up_sentiment
+from stockData import get_stock_data, get_stock_data_many, MAX_BATCH_SYMBOLS
+from stockGraph import get_graph_data, get_prediction_points, forecast_dates, MAX_POINTS
+from predictStock import get_forecast, get_cached_forecast
+from predictionJobs import submit_prediction, get_job
 from popularSymbols import get_popular_stocks
 from marketStatus import get_market_status
+from quoteCache import quote_cache
+from responseCache import cached_route, response_cache, ROUTE_TTLS
+from sentimentHistory import get_sentiment_history
 
 app = Flask(__name__)
 CORS(app)
 
+warm_up_sentiment()
+
 @app.route("/healthz")
 def healthz():
     return jsonify({"status": "ok"})
 
-@app.route("/getstocksentiment", methods=["POST"])
+@app.route("/getcachestats", methods=["GET"])
+def getCacheStats():
+    return jsonify({
+        "quote_cache": quote_cache.stats(),
+        "score_cache": score_cache.stats(),
+        "response_cache": response_cache.stats()
+    })
+
+@app.route("/getstocksentiment", methods=["GET", "POST"])
+@cached_route(ROUTE_TTLS["stocksentiment"])
 def getStockSentiment():
-    stock_symbol = request.form.get("stock_symbol", "")
+    # Normalized like the response cache key, so every request sharing a key gets the same body
+    stock_symbol = request.values.get("stock_symbol", "").upper().strip()
     if not stock_symbol:
         return jsonify({"error": "No stock symbol provided."})
     
@@ -30,28 +47,140 @@ def getStockSentiment():
         "confidence": sentiment_data["confidence"]
     })
     
-@app.route("/getstockdata", methods=["POST"])
+@app.route("/getstockdata", methods=["GET", "POST"])
+@cached_route(ROUTE_TTLS["stockdata"])
 def getStockData():
-    stock_symbol = request.form.get("stock_symbol", "")
+    stock_symbol = request.values.get("stock_symbol", "")
     if not stock_symbol:
         return jsonify({"error": "No stock symbol provided."})
     data = get_stock_data(stock_symbol)
     return jsonify(data) 
 
-@app.route("/getstockgraphdata", methods=["POST"])
+@app.route("/getstockoverview", methods=["GET", "POST"])
+async def getStockOverview():
+    # Quote, chart and sentiment for one symbol, their upstream calls run concurrently
+    stock_symbol = request.values.get("stock_symbol", "")
+    if not stock_symbol:
+        return jsonify({"error": "No stock symbol provided."})
+
+    data, graph, sentiment = await asyncio.gather(
+        asyncio.to_thread(get_stock_data, stock_symbol),
+        asyncio.to_thread(get_graph_data, stock_symbol, 1, False),
+        asyncio.to_thread(get_stock_sentiment, stock_symbol),
+        return_exceptions=True
+    )
+
+    def section(result):
+        return {"error": str(result)} if isinstance(result, Exception) else result
+
+    return jsonify({
+        "stock_symbol": stock_symbol,
+        "data": section(data),
+        "graph": section(graph),
+        "sentiment": section(sentiment)
+    })
+
+@app.route("/getstockdata/batch", methods=["POST"])
+def getStockDataBatch():
+    # Accept either a JSON body {"symbols": [...]} or a comma separated form field
+    payload = request.get_json(silent=True)
+    if payload is None:
+        symbols = request.form.get("stock_symbols", "").split(",")
+    elif isinstance(payload, dict) and isinstance(payload.get("symbols"), list):
+        symbols = payload["symbols"]
+    else:
+        return jsonify({"error": "symbols must be a list of stock symbols."}), 400
+
+    if not all(isinstance(s, str) for s in symbols):
+        return jsonify({"error": "symbols must be a list of stock symbols."}), 400
+
+    symbols = [s.strip().upper() for s in symbols if s and s.strip()]
+    if not symbols:
+        return jsonify({"error": "No stock symbols provided."})
+    if len(symbols) > MAX_BATCH_SYMBOLS:
+        return jsonify({"error": f"At most {MAX_BATCH_SYMBOLS} symbols per request."}), 400
+
+    data = get_stock_data_many(symbols)
+    return jsonify(data)
+
+def forecast_ready(payload):
+    # prediction=async answers null forecast points until the model has run, don't pin those
+    try:
+        days = int(request.values.get("days", 1))
+    except ValueError:
+        return False
+    return all(payload.get(day, 0) is not None for day in forecast_dates(days))
+
+@app.route("/getstockgraphdata", methods=["GET", "POST"])
+@cached_route(ROUTE_TTLS["stockgraph"], cacheable=forecast_ready)
 def getStockGraphData():
-    stock_symbol = request.form.get("stock_symbol", "")
+    stock_symbol = request.values.get("stock_symbol", "")
     if not stock_symbol:
         return jsonify({"error": "No stock symbol provided."})
-    data = get_graph_data(stock_symbol)
+    try:
+        days = int(request.values.get("days", 1))
+        max_points = int(request.values.get("max_points", MAX_POINTS))
+    except ValueError:
+        return jsonify({"error": "days and max_points must be numbers"}), 400
+    # prediction=async returns the history right away, see /getstockprediction
+    wait_for_prediction = request.values.get("prediction", "") != "async"
+    try:
+        data = get_graph_data(
+            stock_symbol,
+            days,
+            wait_for_prediction,
+            chart_range=request.values.get("range") or None,
+            interval=request.values.get("interval", "1d"),
+            max_points=max_points
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(data) 
 
+@app.route("/getstockprediction", methods=["POST"])
+def getStockPrediction():
+    stock_symbol = request.form.get("stock_symbol", "")
+    if not stock_symbol:
+        return jsonify({"error": "No stock symbol provided."})
+    try:
+        days = int(request.form.get("days", 1))
+        data = get_prediction_points(stock_symbol.upper(), days)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(data), 200 if data["status"] == "ready" else 202
+
 @app.route("/getpopularstocks", methods=["GET"])
+@cached_route(ROUTE_TTLS["popularstocks"])
 def getPopularStocks():
-    data = get_popular_stocks()
+    order = request.args.get("order", "top")
+    try:
+        limit = int(request.args.get("limit", 8))
+    except ValueError:
+        return jsonify({"error": "limit must be a number"}), 400
+
+    try:
+        data = get_popular_stocks(limit, order)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(data)
+
+@app.route("/getsentimenthistory", methods=["GET"])
+def getSentimentHistory():
+    stock_symbol = request.args.get("stock_symbol", "")
+    if not stock_symbol:
+        return jsonify({"error": "No stock symbol provided."})
+    try:
+        days = int(request.args.get("days", 30))
+    except ValueError:
+        return jsonify({"error": "days must be a number"}), 400
+    try:
+        data = get_sentiment_history(stock_symbol, days)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     return jsonify(data)
 
 @app.route("/getmarketstatus", methods=["GET"])
+@cached_route(ROUTE_TTLS["marketstatus"])
 def getMarketStatus():
     data = get_market_status()
     return jsonify(data)
@@ -63,14 +192,42 @@ def predict():
     if not symbol:
         return jsonify({"error": "symbol is required"}), 400
 
+    symbol = symbol.upper()
+
     try:
-        result = train_or_predict(symbol.upper())
-        return jsonify({
-            "symbol": symbol.upper(),
-            "prediction": result
-        })
+        days = int(request.form.get("days", 1))
+
+        # Block until the model answers, like before jobs existed
+        if request.form.get("wait", "") == "1":
+            forecast = get_forecast(symbol, days)
+            return jsonify({
+                "symbol": symbol,
+                "prediction": forecast[0],
+                "forecast": forecast
+            })
+
+        cached = get_cached_forecast(symbol, days)
+        if cached is not None:
+            return jsonify({
+                "symbol": symbol,
+                "status": "done",
+                "prediction": cached[0],
+                "forecast": cached
+            })
+
+        job = submit_prediction(symbol)
+        return jsonify(job), 202
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route("/predict/<job_id>", methods=["GET"])
+def predictStatus(job_id):
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown or expired job id"}), 404
+    return jsonify(job)
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
@@ -0,0 +1,81 @@
+import json
+import time
+import threading
+
+# name -> {"fn": callable, "interval": seconds}
+_tasks = {}
+_snapshots = {}
+_version = 0
+_changed = threading.Condition()
+_started = False
+_start_lock = threading.Lock()
+
+
+def register_task(name, fn, interval):
+    """Refresh `fn()` into the snapshot called `name` every `interval` seconds."""
+    _tasks[name] = {"fn": fn, "interval": interval}
+
+
+def publish(name, value):
+    global _version
+    with _changed:
+        if _snapshots.get(name) == value:
+            return
+        _snapshots[name] = value
+        _version += 1
+        _changed.notify_all()
+
+
+def wait_for_update(last_version, timeout=15):
+    """Block until the snapshot version moves past `last_version` or `timeout` passes."""
+    with _changed:
+        _changed.wait_for(lambda: _version != last_version, timeout=timeout)
+        return _version, dict(_snapshots)
+
+
+def _run_task(name, task):
+    while True:
+        started = time.time()
+        try:
+            value = task["fn"]()
+            # Tasks that only refresh their own state return None
+            if value is not None:
+                publish(name, value)
+        except Exception as e:
+            print(f"[ERROR] Background refresh of {name} failed: {e}")
+        time.sleep(max(0.0, task["interval"] - (time.time() - started)))
+
+
+def start_background_tasks():
+    global _started
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+
+    for name, task in _tasks.items():
+        thread = threading.Thread(target=_run_task, args=(name, task), name=f"refresh-{name}", daemon=True)
+        thread.start()
+
+
+def event_stream(names=None, heartbeat=15):
+    """Server-Sent-Events generator pushing every snapshot change to the client."""
+    last_version = -1
+    sent = {}
+
+    while True:
+        version, snapshots = wait_for_update(last_version, timeout=heartbeat)
+
+        if version == last_version:
+            # Keep idle connections (and proxies in between) alive
+            yield ": keep-alive\n\n"
+            continue
+        last_version = version
+
+        for name, value in snapshots.items():
+            if names and name not in names:
+                continue
+            if sent.get(name) == value:
+                continue
+            sent[name] = value
+            yield f"event: {name}\ndata: {json.dumps(value)}\n\n"
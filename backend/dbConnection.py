@@ -1,14 +1,88 @@
 import os
+import time
+import threading
+from contextlib import contextmanager
 import mysql.connector
+from mysql.connector import pooling, errors
 from dotenv import load_dotenv
 
 load_dotenv()
 
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+# How long (seconds) to wait for a free connection before giving up
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _connection_config():
+    return {
+        "host": os.environ["NF_STOCKSENSEDATABASE_HOST"],
+        "user": os.environ["NF_STOCKSENSEDATABASE_USERNAME"],
+        "password": os.environ["NF_STOCKSENSEDATABASE_PASSWORD"],
+        "database": os.environ["NF_STOCKSENSEDATABASE_DATABASE"],
+        "port": int(os.environ.get("NF_STOCKSENSEDATABASE_PORT", 3306))
+    }
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = pooling.MySQLConnectionPool(
+                    pool_name="stocksense",
+                    pool_size=POOL_SIZE,
+                    pool_reset_session=True,
+                    **_connection_config()
+                )
+    return _pool
+
+
 def get_db_connection():
-    return mysql.connector.connect(
-        host=os.environ["NF_STOCKSENSEDATABASE_HOST"],
-        user=os.environ["NF_STOCKSENSEDATABASE_USERNAME"],
-        password=os.environ["NF_STOCKSENSEDATABASE_PASSWORD"],
-        database=os.environ["NF_STOCKSENSEDATABASE_DATABASE"],
-        port=int(os.environ.get("NF_STOCKSENSEDATABASE_PORT", 3306))
-    )
\ No newline at end of file
+    """
+    Check out a connection from the pool. Calling close() on it returns it to the
+    pool, prefer `db_connection()` which always does that.
+    """
+    deadline = time.time() + POOL_TIMEOUT
+    while True:
+        try:
+            conn = get_pool().get_connection()
+            break
+        except errors.PoolError:
+            # Pool exhausted, wait for another request to return a connection
+            if time.time() >= deadline:
+                raise
+            time.sleep(0.05)
+
+    # Health-check, transparently reconnecting connections the server dropped
+    try:
+        conn.ping(reconnect=True, attempts=2, delay=0)
+    except Exception:
+        conn.close()
+        raise
+
+    return conn
+
+
+@contextmanager
+def db_connection():
+    conn = get_db_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def dedicated_connection():
+    """
+    A connection of its own, outside the pool, closed on exit. For sessions held for
+    a long time (e.g. a named lock) that would otherwise starve the pool.
+    """
+    conn = mysql.connector.connect(**_connection_config())
+    try:
+        yield conn
+    finally:
+        conn.close()
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+
+def lttb(x, y, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the
+    visual shape of the (x, y) series. Returns every index if there are fewer points.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # First and last points are always kept, the rest is split into equal buckets
+    every = (n - 2) / (threshold - 2)
+    indices = [0]
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start = int(np.floor((i + 1) * every)) + 1
+        next_end = min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        start = int(np.floor(i * every)) + 1
+        end = int(np.floor((i + 1) * every)) + 1
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        indices.append(a)
+
+    indices.append(n - 1)
+    return np.asarray(indices)
+
+
+def lttb_series(series: pd.Series, max_points: int) -> pd.Series:
+    """Downsample a date-indexed series to at most `max_points` points with LTTB."""
+    series = series.dropna()
+    if max_points is None or len(series) <= max_points:
+        return series
+    x = pd.DatetimeIndex(series.index).asi8
+    return series.iloc[lttb(x, series.to_numpy(dtype=float), max_points)]
+
+
+def resample_ohlc(bars: pd.DataFrame, rule: str) -> pd.DataFrame:
+    """Aggregate OHLCV bars into `rule` buckets (e.g. "W-FRI", "ME"), labelled by their last trading day."""
+    grouped = bars.resample(rule)
+    result = pd.DataFrame({
+        "Open": grouped["Open"].first(),
+        "High": grouped["High"].max(),
+        "Low": grouped["Low"].min(),
+        "Close": grouped["Close"].last(),
+        "Volume": grouped["Volume"].sum(),
+        "date": grouped["Close"].apply(lambda s: s.last_valid_index())
+    }).dropna(subset=["Close"])
+    return result.set_index("date")
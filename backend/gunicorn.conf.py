@@ -0,0 +1,15 @@
+import os
+
+# The API listens on 5000, the "stream" process (Procfile) on STREAM_PORT 5001.
+# Route /stream/ to the stream service in the proxy in front of both
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("GUNICORN_WORKERS", 2))
+# Threaded workers: every request gets its own thread, so blocking upstream calls
+# (yfinance, Reddit, the model Space, MySQL) don't tie up a process. SSE streams run in
+# the separate single-worker "stream" process (Procfile) with a subscriber cap
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", 16))
+# With gthread this is the worker heartbeat, not a per-request limit: slow requests run in
+# their own threads while the main loop keeps notifying. Model calls are bounded by
+# MODEL_CALL_TIMEOUT instead
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
@@ -0,0 +1,166 @@
+import os
+import time
+import sqlite3
+from contextlib import closing
+from datetime import date, timedelta
+import pandas as pd
+import yfinance as yf
+from postStore import DATA_DIR
+
+DB_PATH = os.getenv("HISTORY_STORE_PATH", os.path.join(DATA_DIR, "history.db"))
+# Stored bars are considered current for this long (seconds) before asking for new days
+REFRESH_INTERVAL = int(os.getenv("HISTORY_REFRESH_INTERVAL", 900))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bars (
+    symbol TEXT NOT NULL,
+    date TEXT NOT NULL,
+    open REAL,
+    high REAL,
+    low REAL,
+    close REAL,
+    volume INTEGER,
+    PRIMARY KEY (symbol, date)
+);
+
+CREATE TABLE IF NOT EXISTS refresh_state (
+    symbol TEXT PRIMARY KEY,
+    refreshed_at REAL NOT NULL,
+    earliest TEXT NOT NULL
+);
+"""
+
+
+class HistoryStore:
+    """Local SQLite store of daily OHLCV bars per symbol, appended incrementally."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def _state(self, conn, symbol):
+        row = conn.execute(
+            "SELECT refreshed_at, earliest, (SELECT MAX(date) FROM bars WHERE symbol = ?) "
+            "FROM refresh_state WHERE symbol = ?",
+            (symbol, symbol)
+        ).fetchone()
+        return row if row is not None else (None, None, None)
+
+    def save_bars(self, symbol, hist: pd.DataFrame):
+        rows = [
+            (
+                symbol,
+                day.date().isoformat(),
+                float(row["Open"]),
+                float(row["High"]),
+                float(row["Low"]),
+                float(row["Close"]),
+                int(row["Volume"]) if pd.notna(row["Volume"]) else None
+            )
+            for day, row in hist.iterrows()
+            if pd.notna(row["Close"])
+        ]
+        if not rows:
+            return
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                """
+                INSERT INTO bars (symbol, date, open, high, low, close, volume)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (symbol, date) DO UPDATE SET
+                    open = excluded.open,
+                    high = excluded.high,
+                    low = excluded.low,
+                    close = excluded.close,
+                    volume = excluded.volume
+                """,
+                rows
+            )
+
+    @staticmethod
+    def _fetch(symbol, start: date) -> pd.DataFrame:
+        return yf.Ticker(symbol).history(
+            start=start.isoformat(),
+            end=(date.today() + timedelta(days=1)).isoformat(),
+            interval="1d"
+        )
+
+    @staticmethod
+    def _has_new_actions(hist: pd.DataFrame, last_stored: str) -> bool:
+        """Whether `hist` has a split or dividend after `last_stored`, whose fetch already saw its own."""
+        actions = [c for c in ("Stock Splits", "Dividends") if c in hist.columns]
+        if not actions or hist.empty:
+            return False
+        newer = hist[hist.index.strftime("%Y-%m-%d") > last_stored]
+        return bool((newer[actions].fillna(0) != 0).any().any())
+
+    def refresh(self, symbol, start: date):
+        """Make sure bars from `start` until today are stored, fetching only what's missing."""
+        with closing(self._connect()) as conn:
+            refreshed_at, earliest, last_stored = self._state(conn, symbol)
+
+        covers_start = earliest is not None and earliest <= start.isoformat()
+        if covers_start and time.time() - refreshed_at < REFRESH_INTERVAL:
+            return
+
+        if covers_start and last_stored is not None:
+            # Refetch the last stored day too, it may have been an unfinished session
+            fetch_from = date.fromisoformat(last_stored)
+        else:
+            fetch_from = start
+        earliest = start.isoformat() if not covers_start else earliest
+
+        hist = self._fetch(symbol, fetch_from)
+        if covers_start and last_stored is not None and self._has_new_actions(hist, last_stored):
+            # Bars are split/dividend adjusted, a new action re-bases every stored price
+            print(f"Corporate action for {symbol}, refetching history since {earliest}")
+            hist = self._fetch(symbol, date.fromisoformat(earliest))
+        self.save_bars(symbol, hist)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO refresh_state (symbol, refreshed_at, earliest)
+                VALUES (?, ?, ?)
+                ON CONFLICT (symbol) DO UPDATE SET
+                    refreshed_at = excluded.refreshed_at,
+                    earliest = excluded.earliest
+                """,
+                (symbol, time.time(), earliest)
+            )
+
+    def get_bars(self, symbol, start: date, end: date = None) -> pd.DataFrame:
+        """Stored bars between `start` and `end` (inclusive), indexed by date."""
+        end = end or date.today()
+        with closing(self._connect()) as conn:
+            hist = pd.read_sql_query(
+                """
+                SELECT date, open AS Open, high AS High, low AS Low, close AS Close, volume AS Volume
+                FROM bars
+                WHERE symbol = ? AND date BETWEEN ? AND ?
+                ORDER BY date
+                """,
+                conn,
+                params=(symbol, start.isoformat(), end.isoformat()),
+                parse_dates=["date"],
+                index_col="date"
+            )
+        return hist
+
+    def get_history(self, symbol, start: date, end: date = None) -> pd.DataFrame:
+        symbol = symbol.upper().strip()
+        self.refresh(symbol, start)
+        return self.get_bars(symbol, start, end)
+
+
+history_store = HistoryStore()
+
+
+def get_history(symbol, start, end=None):
+    return history_store.get_history(symbol, start, end)
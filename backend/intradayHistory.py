@@ -0,0 +1,86 @@
+import os
+import time
+import threading
+from collections import deque
+import pandas as pd
+import yfinance as yf
+
+# Interval -> (bars kept per symbol, period fetched when a symbol is first requested)
+INTRADAY_INTERVALS = {
+    "1m": (int(os.getenv("INTRADAY_1M_BARS", 390)), "1d"),
+    "5m": (int(os.getenv("INTRADAY_5M_BARS", 390)), "5d"),
+}
+# Symbols nobody asked about for this long (seconds) are dropped
+IDLE_TTL = int(os.getenv("INTRADAY_IDLE_TTL", 900))
+# Buffers older than this (seconds) are topped up on the next read
+REFRESH_INTERVAL = int(os.getenv("INTRADAY_REFRESH_INTERVAL", 60))
+
+
+class IntradayBuffers:
+    """Bounded in-memory ring buffers of intraday closes, shared by every request."""
+
+    def __init__(self):
+        self._buffers = {}  # (symbol, interval) -> {"bars": deque, "last_request": ts, "lock": Lock}
+        self._lock = threading.Lock()
+
+    def _entry(self, symbol, interval):
+        key = (symbol, interval)
+        with self._lock:
+            entry = self._buffers.get(key)
+            if entry is None:
+                # New symbols are rare, a good moment to forget the ones nobody reads anymore
+                now = time.time()
+                for idle in [k for k, e in self._buffers.items() if now - e["last_request"] > IDLE_TTL]:
+                    del self._buffers[idle]
+                entry = {
+                    "bars": deque(maxlen=INTRADAY_INTERVALS[interval][0]),
+                    "last_request": time.time(),
+                    "refreshed_at": 0.0,
+                    "lock": threading.Lock()
+                }
+                self._buffers[key] = entry
+            return entry
+
+    def refresh(self, symbol, interval):
+        entry = self._entry(symbol, interval)
+        with entry["lock"]:
+            # Another request may have topped it up while this one waited for the lock
+            if time.time() - entry["refreshed_at"] < REFRESH_INTERVAL:
+                return
+            bars = entry["bars"]
+            period = "1d" if bars else INTRADAY_INTERVALS[interval][1]
+            hist = yf.Ticker(symbol).history(period=period, interval=interval)
+
+            last_ts = bars[-1][0] if bars else None
+            for ts, close in hist["Close"].dropna().items():
+                if last_ts is not None and ts < last_ts:
+                    continue
+                if ts == last_ts:
+                    # The latest bar is still forming, replace it
+                    bars[-1] = (ts, round(float(close), 2))
+                else:
+                    bars.append((ts, round(float(close), 2)))
+                last_ts = ts
+            entry["refreshed_at"] = time.time()
+
+    def get_closes(self, symbol, interval) -> pd.Series:
+        if interval not in INTRADAY_INTERVALS:
+            raise ValueError(f"interval must be one of {', '.join(INTRADAY_INTERVALS)}")
+
+        symbol = symbol.upper().strip()
+        entry = self._entry(symbol, interval)
+        entry["last_request"] = time.time()
+        if time.time() - entry["refreshed_at"] >= REFRESH_INTERVAL:
+            # Only the bars since the last refresh are fetched once the buffer is filled
+            self.refresh(symbol, interval)
+
+        with entry["lock"]:
+            bars = list(entry["bars"])
+        return pd.Series([c for _, c in bars], index=pd.DatetimeIndex([t for t, _ in bars]), dtype=float)
+
+
+intraday_buffers = IntradayBuffers()
+
+
+def get_intraday_closes(symbol, interval):
+    return intraday_buffers.get_closes(symbol, interval)
@@ -0,0 +1,63 @@
+import bisect
+import threading
+
+
+class Leaderboard:
+    """In-memory ranking of stocks by sentiment, each carrying the sentiment_change it was given."""
+
+    def __init__(self):
+        self._stocks = {}   # symbol -> stock dict
+        self._ranked = []   # sorted (-sentiment, symbol) keys, best first
+        self._lock = threading.Lock()
+        self.loaded = False
+
+    @staticmethod
+    def _key(stock):
+        return (-stock["sentiment"], stock["symbol"])
+
+    def _put(self, stock):
+        stock.setdefault("sentiment_change", 0)
+        old = self._stocks.get(stock["symbol"])
+        if old is not None:
+            del self._ranked[bisect.bisect_left(self._ranked, self._key(old))]
+
+        self._stocks[stock["symbol"]] = stock
+        bisect.insort(self._ranked, self._key(stock))
+
+    def update(self, stocks, replace=False):
+        """
+        Insert or replace stocks ({symbol, name, sentiment, current_price,
+        sentiment_change}). With `replace`, stocks missing from `stocks` are dropped.
+        """
+        with self._lock:
+            seen = set()
+            for stock in stocks:
+                self._put(dict(stock))
+                seen.add(stock["symbol"])
+
+            if replace:
+                for symbol in set(self._stocks) - seen:
+                    old = self._stocks.pop(symbol)
+                    del self._ranked[bisect.bisect_left(self._ranked, self._key(old))]
+
+            self.loaded = True
+
+    def _rows(self, keys):
+        return [dict(self._stocks[symbol]) for _, symbol in keys]
+
+    def top(self, n):
+        with self._lock:
+            return self._rows(self._ranked[:n])
+
+    def bottom(self, n):
+        with self._lock:
+            return self._rows(reversed(self._ranked[-n:] if n else []))
+
+    def trending(self, n):
+        """Largest sentiment gains, by sentiment_change."""
+        with self._lock:
+            stocks = sorted(self._stocks.values(), key=lambda s: (-s["sentiment_change"], s["symbol"]))
+            return [dict(s) for s in stocks[:n]]
+
+
+leaderboard = Leaderboard()
@@ -0,0 +1,72 @@
+import time
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe LRU of at most `max_size` entries with hit/miss counters. Entries
+    expire after `ttl` seconds when one is given, either per cache or per lookup.
+    """
+
+    def __init__(self, max_size, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key, ttl):
+        entry = self._entries.get(key)
+        if entry is not None and (ttl is None or time.time() - entry[0] < ttl):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def get_entry(self, key, ttl=None):
+        """(stored_at, value) if `key` is cached and younger than `ttl` (default: the cache's), else None."""
+        with self._lock:
+            return self._lookup(key, self.ttl if ttl is None else ttl)
+
+    def get(self, key, ttl=None):
+        entry = self.get_entry(key, ttl)
+        return entry[1] if entry is not None else None
+
+    def get_many(self, keys):
+        """Returns the cached value for every key, None for misses."""
+        with self._lock:
+            entries = [self._lookup(key, self.ttl) for key in keys]
+        return [entry[1] if entry is not None else None for entry in entries]
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def put_many(self, items):
+        now = time.time()
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = (now, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
@@ -1,27 +1,32 @@
-import yfinance as yf
+from quoteCache import get_info_many
 
-def get_market_status():
-    symbols = {
-        "S&P 500": "^GSPC",
-        "Nasdaq": "^IXIC",
-        "Dow": "^DJI",
-        "VIX": "^VIX"
-    }
+INDEX_SYMBOLS = {
+    "S&P 500": "^GSPC",
+    "Nasdaq": "^IXIC",
+    "Dow": "^DJI",
+    "VIX": "^VIX"
+}
 
+# Index quotes come from the shared quote cache, which also coalesces concurrent fetches
+def get_market_status():
     result = {
         "market_open": False,
         "indexes": {}
     }
 
+    # Fetch all indexes concurrently in one pass
+    infos = get_info_many(INDEX_SYMBOLS.values())
+
     # Check market state using Nasdaq ticker as reference
-    nasdaq_ticker = yf.Ticker(symbols["Nasdaq"])
-    market_state = nasdaq_ticker.info.get("marketState", "CLOSED")
-    result["market_open"] = market_state == "REGULAR"
+    nasdaq_info = infos.get(INDEX_SYMBOLS["Nasdaq"])
+    if isinstance(nasdaq_info, dict):
+        market_state = nasdaq_info.get("marketState", "CLOSED")
+        result["market_open"] = market_state == "REGULAR"
 
-    # Fetch info for each index
-    for name, symbol in symbols.items():
-        ticker = yf.Ticker(symbol)
-        info = ticker.info
+    for name, symbol in INDEX_SYMBOLS.items():
+        info = infos.get(symbol)
+        if not isinstance(info, dict):
+            info = {}
 
         price = info.get("regularMarketPrice", None)
         previous_close = info.get("previousClose", None)
@@ -35,4 +40,5 @@ def get_market_status():
             "change": change
         }
 
-    return result
\ No newline at end of file
+    return result
+
@@ -0,0 +1,48 @@
+-- Schema changes on top of the existing StockSense database, apply in order.
+
+-- Multi-day forecasts: the whole prediction vector (JSON list) and the day it was generated
+ALTER TABLE Symbols
+    ADD COLUMN forecast TEXT NULL,
+    ADD COLUMN forecast_date DATE NULL;
+
+-- save_predictions and _train_or_predict upsert into Symbols, which needs symbol to be unique
+-- (skip if it already is the primary key)
+ALTER TABLE Symbols
+    ADD UNIQUE KEY uq_symbols_symbol (symbol);
+
+-- update_sentiments upserts into Daily_Sen, which needs symbol to be unique
+-- (skip if it already is the primary key)
+ALTER TABLE Daily_Sen
+    ADD UNIQUE KEY uq_daily_sen_symbol (symbol);
+
+-- Append-only sentiment/price history written by update_sentiments, one partition per month.
+-- `python sentimentHistory.py` (run monthly, e.g. from cron) splits p_future into the
+-- next months' partitions, old months can be dropped with ALTER TABLE ... DROP PARTITION.
+CREATE TABLE IF NOT EXISTS Sentiment_History (
+    day DATE NOT NULL,
+    symbol VARCHAR(16) NOT NULL,
+    recorded_at DATETIME NOT NULL,
+    sentiment SMALLINT NOT NULL,
+    price DECIMAL(14, 4) NULL,
+    PRIMARY KEY (day, symbol, recorded_at)
+)
+PARTITION BY RANGE COLUMNS (day) (
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p202701 VALUES LESS THAN ('2027-02-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
+
+-- Per-day aggregates of Sentiment_History, kept up to date on every write
+CREATE TABLE IF NOT EXISTS Sentiment_Daily (
+    symbol VARCHAR(16) NOT NULL,
+    day DATE NOT NULL,
+    samples INT NOT NULL,
+    avg_sentiment DOUBLE NOT NULL,
+    min_sentiment SMALLINT NOT NULL,
+    max_sentiment SMALLINT NOT NULL,
+    last_sentiment SMALLINT NOT NULL,
+    last_price DECIMAL(14, 4) NULL,
+    PRIMARY KEY (symbol, day)
+);
@@ -0,0 +1,88 @@
+import os
+import queue
+import threading
+import httpx
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from gradio_client import Client
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SPACE_NAME = "MLSpeech/StockSenseSpace"
+POOL_SIZE = int(os.getenv("MODEL_CLIENT_POOL_SIZE", 4))
+# Seconds to wait for a single /train or /predict call
+CALL_TIMEOUT = float(os.getenv("MODEL_CALL_TIMEOUT", 600))
+# Seconds for the HTTP requests made while connecting to the Space
+CONNECT_TIMEOUT = float(os.getenv("MODEL_CONNECT_TIMEOUT", 30))
+# Failures that mean the connection went bad, anything else is the Space answering with an error
+TRANSPORT_ERRORS = (httpx.TransportError, ConnectionError)
+
+
+class ModelClientPool:
+    """Long-lived gradio clients for the prediction Space, created lazily and reused."""
+
+    def __init__(self, size=POOL_SIZE):
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        try:
+            return Client(
+                SPACE_NAME,
+                token=os.getenv("HF_TOKEN"),
+                httpx_kwargs={"timeout": CONNECT_TIMEOUT}
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to connect to {SPACE_NAME}: {e}") from e
+
+    def _checkout(self):
+        if not self._slots.acquire(timeout=CALL_TIMEOUT):
+            raise RuntimeError("Timed out waiting for a free model client")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def _checkin(self, client, healthy=True):
+        # Broken clients are dropped, the next checkout reconnects
+        if healthy:
+            self._idle.put(client)
+        self._slots.release()
+
+    def predict(self, api_name, **kwargs):
+        """Call `api_name` on the Space, reconnecting once if the connection has gone bad."""
+        for attempt in range(2):
+            client = self._checkout()
+            job = None
+            try:
+                job = client.submit(api_name=api_name, **kwargs)
+                result = job.result(timeout=CALL_TIMEOUT)
+            except FutureTimeoutError:
+                job.cancel()
+                self._checkin(client, healthy=False)
+                raise RuntimeError(f"{api_name} did not finish within {CALL_TIMEOUT:g}s")
+            except TRANSPORT_ERRORS:
+                self._checkin(client, healthy=False)
+                if attempt == 1:
+                    raise
+                print(f"[ERROR] {api_name} call failed, reconnecting to {SPACE_NAME}")
+                continue
+            except Exception:
+                # The Space rejected the call, retrying would fail the same way
+                self._checkin(client)
+                raise
+
+            self._checkin(client)
+            return result
+
+
+model_clients = ModelClientPool()
+
+
+def call_model(api_name, **kwargs):
+    return model_clients.predict(api_name, **kwargs)
@@ -1,56 +1,184 @@
-from dbConnection import get_db_connection
+from dbConnection import db_connection
 from stockSentiment import get_stock_sentiment
-from stockData import get_stock_data
+from stockData import get_stock_data_many
+from leaderboard import leaderboard
+from sentimentHistory import record_sentiments, get_previous_sentiments
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 popular_symbols = ["AAPL", "MSFT", "NVDA", "GOOGL", "AMZN", "META", "TSLA", "AMD"]
 
-def update_sentiments():
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+# How many symbols are analyzed at the same time during a refresh
+SENTIMENT_WORKERS = int(os.getenv("SENTIMENT_WORKERS", 4))
+# Largest `limit` get_popular_stocks accepts
+MAX_POPULAR_LIMIT = int(os.getenv("MAX_POPULAR_LIMIT", 100))
+# How often (seconds) the leaderboard re-reads Daily_Sen, which the refresher job writes
+LEADERBOARD_SYNC_INTERVAL = int(os.getenv("LEADERBOARD_SYNC_INTERVAL", 60))
 
+_last_sync = 0.0
+
+
+def get_symbol_universe():
+    """
+    Symbols refreshed by update_sentiments: SENTIMENT_SYMBOLS (comma separated) when
+    set, otherwise popular_symbols plus every symbol already in Daily_Sen.
+    """
+    configured = os.getenv("SENTIMENT_SYMBOLS", "")
+    if configured.strip():
+        return list(dict.fromkeys(s.strip().upper() for s in configured.split(",") if s.strip()))
+
+    with db_connection() as conn, conn.cursor() as cursor:
+        cursor.execute("SELECT symbol FROM Daily_Sen")
+        stored = [row[0] for row in cursor.fetchall()]
+    return list(dict.fromkeys(popular_symbols + stored))
+
+
+UPSERT_SENTIMENT = """
+    INSERT INTO Daily_Sen (symbol, name, sentiment, price)
+    VALUES (%s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        sentiment = VALUES(sentiment),
+        price = VALUES(price)
+"""
+
+
+def _save_sentiments(rows):
+    """
+    Upsert the rows into Daily_Sen in one batch. If the batch fails, each row is
+    retried on its own so the good ones still commit. Returns the rows written.
+    """
+    if not rows:
+        return rows
+
+    with db_connection() as conn, conn.cursor() as cursor:
+        try:
+            cursor.executemany(UPSERT_SENTIMENT, rows)
+            conn.commit()
+            return rows
+        except Exception as e:
+            print("Error writing sentiment batch, retrying per symbol:", e)
+            conn.rollback()
+
+        saved = []
+        for row in rows:
+            try:
+                cursor.execute(UPSERT_SENTIMENT, row)
+                conn.commit()
+                saved.append(row)
+            except Exception as e:
+                print(f"Error writing {row[0]}:", e)
+                conn.rollback()
+        return saved
+
+
+def update_sentiments(symbols=None, max_workers=SENTIMENT_WORKERS):
+    """
+    Recompute sentiment and price for every symbol and upsert them into Daily_Sen in
+    one batch. A symbol that fails to compute or to write is skipped without
+    affecting the others.
+    Returns the (symbol, name, sentiment, price) rows that were written.
+    """
+    symbols = get_symbol_universe() if symbols is None else [s.upper() for s in symbols]
+
+    # Fetch all prices in one bulk pass instead of one request per symbol
+    stock_data = get_stock_data_many(symbols)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        sentiments = dict(zip(symbols, pool.map(get_stock_sentiment, symbols)))
+
+    rows = []
+    for symbol in symbols:
+        sent = sentiments[symbol]
+        data = stock_data.get(symbol, {"error": "No stock data"})
+        if "error" in sent or "error" in data:
+            print(f"Skipped {symbol}: {sent.get('error') or data.get('error')}")
+            continue
+        price = data["currentPrice"]
+        # build_stock_data reports a missing price as "---"
+        if not isinstance(price, (int, float)):
+            print(f"Skipped {symbol}: no current price")
+            continue
+        name = data["longName"] if data["longName"] != "---" else symbol
+        rows.append((symbol, name, sent["sentiment"], price))
+
+    rows = _save_sentiments(rows)
+    if not rows:
+        return rows
+
+    # History is append-only bookkeeping, a failure here must not undo the refresh
     try:
-        for symbol in popular_symbols:
-            sent = get_stock_sentiment(symbol)['sentiment']
-            price = get_stock_data(symbol)['currentPrice']
-            sql = "UPDATE Daily_Sen SET sentiment = %s, price = %s WHERE symbol = %s"
-            cursor.execute(sql, (sent, price, symbol))
-            print(f"Updated {symbol}")
+        record_sentiments([(symbol, sent, price) for symbol, _, sent, price in rows])
+    except Exception as e:
+        print("Error recording sentiment history:", e)
+
+    leaderboard.update(_with_changes([
+        {"symbol": symbol, "name": name, "sentiment": int(sent), "current_price": float(price)}
+        for symbol, name, sent, price in rows
+    ]))
 
-        # Commit all updates
-        conn.commit()
+    print(f"Updated {len(rows)} of {len(symbols)} symbols")
+    return rows
 
+
+def _with_changes(stocks):
+    """
+    Set each stock's sentiment_change to its sentiment minus the last one recorded on the
+    previous day in Sentiment_Daily, so every process ranks "trending" the same way.
+    """
+    try:
+        previous = get_previous_sentiments()
     except Exception as e:
-        print("Error:", e)
-        conn.rollback()
-    finally:
-        cursor.close()
-        conn.close()
-        
+        print("Error loading previous sentiments:", e)
+        previous = {}
 
-def get_popular_stocks(limit=8):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+    for stock in stocks:
+        last = previous.get(stock["symbol"])
+        stock["sentiment_change"] = stock["sentiment"] - last if last is not None else 0
+    return stocks
 
+
+def sync_leaderboard():
+    """Load every Daily_Sen row into the in-memory leaderboard, MySQL stays the durable source."""
+    global _last_sync
+    _last_sync = time.time()
     query = """
         SELECT symbol, name, sentiment, price
         FROM Daily_Sen
-        ORDER BY sentiment DESC
-        LIMIT %s
     """
-    cursor.execute(query, (limit,))
-    rows = cursor.fetchall()
+    with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+        cursor.execute(query)
+        rows = cursor.fetchall()
 
-    stocks_list = []
-    for row in rows:
-        stock = {
+    leaderboard.update(_with_changes([
+        {
             "symbol": row["symbol"],
             "name": row["name"],
             "sentiment": int(row["sentiment"]),
             "current_price": float(row["price"]),
         }
-        stocks_list.append(stock)
+        for row in rows
+        if row["sentiment"] is not None and row["price"] is not None
+    ]), replace=True)
+
+
+def get_popular_stocks(limit=8, order="top"):
+    """
+    Stocks ranked by sentiment from the in-memory leaderboard.
+    order: "top" (most positive), "bottom" (most negative) or "trending" (biggest gain since the previous day)
+    """
+    if not 1 <= limit <= MAX_POPULAR_LIMIT:
+        raise ValueError(f"limit must be between 1 and {MAX_POPULAR_LIMIT}")
+
+    if not leaderboard.loaded or time.time() - _last_sync >= LEADERBOARD_SYNC_INTERVAL:
+        sync_leaderboard()
 
-    return stocks_list
+    if order == "top":
+        return leaderboard.top(limit)
+    if order == "bottom":
+        return leaderboard.bottom(limit)
+    if order == "trending":
+        return leaderboard.trending(limit)
+    raise ValueError("order must be one of top, bottom, trending")
     
     
 if (__name__ == "__main__"):
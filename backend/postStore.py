@@ -0,0 +1,116 @@
+import os
+import time
+import sqlite3
+from contextlib import closing
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DB_PATH = os.getenv("POST_STORE_PATH", os.path.join(DATA_DIR, "posts.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    symbol TEXT NOT NULL,
+    id TEXT NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    text TEXT NOT NULL DEFAULT '',
+    score INTEGER NOT NULL DEFAULT 0,
+    created_utc REAL,
+    PRIMARY KEY (symbol, id)
+);
+CREATE INDEX IF NOT EXISTS idx_posts_symbol_created ON posts (symbol, created_utc);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    symbol TEXT PRIMARY KEY,
+    last_synced REAL NOT NULL,
+    last_seen_utc REAL
+);
+"""
+
+
+class PostStore:
+    """Local SQLite store of Reddit submissions per stock symbol."""
+
+    def __init__(self, path=DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    def _connect(self):
+        # A short-lived connection per call keeps this safe across threads
+        return sqlite3.connect(self.path, timeout=10)
+
+    def save_posts(self, symbol, posts):
+        rows = [
+            (symbol, p["id"], p["title"], p["text"], p["score"], p["created_utc"])
+            for p in posts if p.get("id")
+        ]
+        if not rows:
+            return
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                """
+                INSERT INTO posts (symbol, id, title, text, score, created_utc)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (symbol, id) DO UPDATE SET
+                    title = excluded.title,
+                    text = excluded.text,
+                    score = excluded.score
+                """,
+                rows
+            )
+
+    def update_scores(self, symbol, scores):
+        """Overwrite the stored score of already known posts, `scores` maps post id -> score."""
+        if not scores:
+            return
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "UPDATE posts SET score = ? WHERE symbol = ? AND id = ?",
+                [(score, symbol, post_id) for post_id, score in scores.items()]
+            )
+
+    def get_posts(self, symbol, since_utc=None, limit=None):
+        query = "SELECT id, title, text, score, created_utc FROM posts WHERE symbol = ?"
+        params = [symbol]
+        if since_utc is not None:
+            query += " AND created_utc >= ?"
+            params.append(since_utc)
+        query += " ORDER BY created_utc DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return [
+            {"id": r[0], "title": r[1], "text": r[2], "score": r[3], "created_utc": r[4]}
+            for r in rows
+        ]
+
+    def get_sync_state(self, symbol):
+        """Returns (last_synced, last_seen_utc), or (None, None) for unknown symbols."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT last_synced, last_seen_utc FROM sync_state WHERE symbol = ?",
+                (symbol,)
+            ).fetchone()
+        return row if row is not None else (None, None)
+
+    def mark_synced(self, symbol, last_seen_utc=None):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                INSERT INTO sync_state (symbol, last_synced, last_seen_utc)
+                VALUES (?, ?, ?)
+                ON CONFLICT (symbol) DO UPDATE SET
+                    last_synced = excluded.last_synced,
+                    last_seen_utc = COALESCE(MAX(excluded.last_seen_utc, sync_state.last_seen_utc),
+                                             excluded.last_seen_utc, sync_state.last_seen_utc)
+                """,
+                (symbol, time.time(), last_seen_utc)
+            )
+
+
+post_store = PostStore()
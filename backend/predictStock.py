@@ -1,37 +1,122 @@
+import json
 from datetime import date, datetime
-from gradio_client import Client
-from dbConnection import get_db_connection
+from dbConnection import db_connection, dedicated_connection
+from modelClient import call_model
+from singleFlight import SingleFlight
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def train_or_predict(symbol: str):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+# Also serialize runs across gunicorn workers with a MySQL named lock
+USE_DB_LOCK = os.getenv("PREDICT_DB_LOCK", "0") == "1"
+DB_LOCK_TIMEOUT = int(os.getenv("PREDICT_DB_LOCK_TIMEOUT", 600))
+# Days forecast by every model call, any shorter horizon is served from the stored vector
+PREDICTION_HORIZON = int(os.getenv("PREDICTION_HORIZON", 10))
 
-    # 1. Check symbol state
+_flights = SingleFlight()
+
+def _fetch_symbol_row(cursor, symbol):
     cursor.execute(
         """
-        SELECT symbol, last_trained, prediction
+        SELECT symbol, last_trained, prediction, forecast, forecast_date
         FROM Symbols
         WHERE symbol = %s
         """,
         (symbol,)
     )
-    row = cursor.fetchone()
-
-    # ✅ If already predicted today, return stored prediction immediately
-    if (
-        row is not None
-        and row["prediction"] is not None
-        and row["last_trained"] is not None
-        and row["last_trained"].date() == date.today()
-    ):
-        prediction_value = float(row["prediction"])
-        cursor.close()
-        conn.close()
-        return prediction_value
+    return cursor.fetchone()
+
+
+def _stored_forecast(row, days=1):
+    """The stored forecast vector if it was generated today and covers `days` days, else None."""
+    if row is None or row["forecast"] is None or row["forecast_date"] != date.today():
+        return None
+    forecast = json.loads(row["forecast"])
+    return forecast if len(forecast) >= days else None
+
+
+def _check_days(days):
+    if not 1 <= days <= PREDICTION_HORIZON:
+        raise ValueError(f"days must be between 1 and {PREDICTION_HORIZON}")
+
+
+def get_cached_forecast(symbol: str, days: int = 1):
+    """
+    Today's stored forecast for the next `days` days (the whole stored vector when
+    `days` is None), or None if the symbol still needs a model run.
+    """
+    if days is not None:
+        _check_days(days)
+    with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+        row = _fetch_symbol_row(cursor, symbol)
+    forecast = _stored_forecast(row, days or 1)
+    return forecast[:days] if forecast is not None else None
+
+
+def train_symbol(symbol: str):
+    call_model(
+        "/train",
+        symbol=symbol,
+        start=None,
+        end=None
+    )
+
+
+def predict_symbol(symbol: str, days: int = PREDICTION_HORIZON) -> list:
+    prediction_result = call_model(
+        "/predict",
+        symbol=symbol,
+        days=days
+    )
+    return [float(p) for p in prediction_result["predictions"][:days]]
+
+
+def get_stale_symbols(symbols=None):
+    """Symbols from the Symbols table (plus `symbols`) without a forecast from today."""
+    with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+        cursor.execute("SELECT symbol, last_trained, prediction, forecast, forecast_date FROM Symbols")
+        rows = {row["symbol"]: row for row in cursor.fetchall()}
+
+    candidates = list(dict.fromkeys(list(rows) + [s.upper() for s in (symbols or [])]))
+    return [s for s in candidates if _stored_forecast(rows.get(s)) is None]
+
+
+def save_predictions(results):
+    """Bulk upsert of (symbol, trained_at, forecast) rows."""
+    if not results:
+        return
+    today = date.today()
+    rows = [
+        (symbol, trained_at, forecast[0], json.dumps(forecast), today)
+        for symbol, trained_at, forecast in results
+    ]
+    with db_connection() as conn, conn.cursor() as cursor:
+        cursor.executemany(
+            """
+            INSERT INTO Symbols (symbol, last_trained, prediction, forecast, forecast_date)
+            VALUES (%s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                last_trained = VALUES(last_trained),
+                prediction = VALUES(prediction),
+                forecast = VALUES(forecast),
+                forecast_date = VALUES(forecast_date)
+            """,
+            rows
+        )
+        conn.commit()
+
+
+def _train_or_predict(symbol: str, days: int = 1):
+    # Model calls can take minutes, so no pooled connection is held across them
+    # 1. Check symbol state
+    with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+        row = _fetch_symbol_row(cursor, symbol)
+
+    # ✅ If already forecast today, return the stored vector immediately
+    forecast = _stored_forecast(row, days)
+    if forecast is not None:
+        return forecast
 
     # 2. Decide if training is needed
     needs_training = False
@@ -49,59 +134,68 @@ def train_or_predict(symbol: str):
     # 3. Train if needed
     if needs_training:
         print("Training is NEEDED")
-        client = Client("MLSpeech/StockSenseSpace", token=os.getenv("HF_TOKEN"))
-        client.predict(
-            symbol=symbol,
-            api_name="/train",
-            start=None,
-            end=None
-        )
+        train_symbol(symbol)
 
-        now = datetime.now()
-
-        if row is None:
+        with db_connection() as conn, conn.cursor() as cursor:
+            # Another worker may have inserted the row while the model was training
             cursor.execute(
                 """
                 INSERT INTO Symbols (symbol, last_trained, prediction)
                 VALUES (%s, %s, NULL)
+                ON DUPLICATE KEY UPDATE last_trained = VALUES(last_trained)
                 """,
-                (symbol, now)
-            )
-        else:
-            cursor.execute(
-                """
-                UPDATE Symbols
-                SET last_trained = %s
-                WHERE symbol = %s
-                """,
-                (now, symbol)
+                (symbol, datetime.now())
             )
+            conn.commit()
 
+    # 4. Predict the whole horizon in one call, shorter horizons are served from it
+    print("PREDICTING...")
+    forecast = predict_symbol(symbol)
+
+    with db_connection() as conn, conn.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE Symbols
+            SET prediction = %s, forecast = %s, forecast_date = %s
+            WHERE symbol = %s
+            """,
+            (forecast[0], json.dumps(forecast), date.today(), symbol)
+        )
         conn.commit()
 
-    # 4. Predict (only if we didn't already have today's prediction)
-    print("PREDICTING...")
-    client = Client("MLSpeech/StockSenseSpace", token=os.getenv("HF_TOKEN"))
-    prediction_result = client.predict(
-        symbol=symbol,
-        days=1,
-        api_name="/predict"
-    )
+    return forecast
 
-    prediction_value = float(prediction_result["predictions"][0])
 
-    cursor.execute(
-        """
-        UPDATE Symbols
-        SET prediction = %s
-        WHERE symbol = %s
-        """,
-        (prediction_value, symbol)
-    )
+def _train_or_predict_locked(symbol: str, days: int = 1):
+    if not USE_DB_LOCK:
+        return _train_or_predict(symbol, days)
+
+    # GET_LOCK belongs to the connection, so hold one outside the pool until the run is over
+    lock_name = f"stocksense_predict_{symbol}"[:64]
+    with dedicated_connection() as lock_conn, lock_conn.cursor() as cursor:
+        cursor.execute("SELECT GET_LOCK(%s, %s)", (lock_name, DB_LOCK_TIMEOUT))
+        (acquired,) = cursor.fetchone()
+        if acquired != 1:
+            raise RuntimeError(f"Timed out waiting for another worker to predict '{symbol}'")
+        try:
+            # Another worker may have finished while we waited, which the
+            # "already predicted today" check picks up without a model call
+            return _train_or_predict(symbol, days)
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (lock_name,))
+            cursor.fetchone()
 
-    conn.commit()
 
-    cursor.close()
-    conn.close()
+def get_forecast(symbol: str, days: int = 1) -> list:
+    """
+    Return the predictions for the next `days` days, training first if needed.
+    Concurrent calls for the same symbol share a single model run.
+    """
+    _check_days(days)
+    forecast = _flights.do(symbol, lambda: _train_or_predict_locked(symbol, days))
+    return forecast[:days]
 
-    return prediction_value
+
+def train_or_predict(symbol: str):
+    """Return tomorrow's prediction for `symbol`, training first if needed."""
+    return get_forecast(symbol, 1)[0]
@@ -0,0 +1,114 @@
+import os
+import time
+import uuid
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from predictStock import get_forecast, get_cached_forecast, PREDICTION_HORIZON
+
+JOB_WORKERS = int(os.getenv("PREDICTION_JOB_WORKERS", 2))
+# Finished jobs stay queryable for this long (seconds)
+JOB_TTL = int(os.getenv("PREDICTION_JOB_TTL", 3600))
+
+_executor = ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="predict-job")
+_jobs = {}    # job_id -> job, only in the worker process that queued it
+_active = {}  # symbol -> job_id of its queued or running job
+_lock = threading.Lock()
+
+
+def _make_job_id(symbol, created_at):
+    # Creation time, horizon and symbol are part of the id so any worker can answer for it
+    return f"{int(created_at):08x}{uuid.uuid4().hex[:16]}-{PREDICTION_HORIZON}-{symbol}"
+
+
+def _new_job(job_id, symbol, created_at):
+    return {
+        "job_id": job_id,
+        "symbol": symbol,
+        "status": "queued",
+        "prediction": None,
+        "forecast": None,
+        "error": None,
+        "created_at": created_at,
+        "finished_at": None
+    }
+
+
+def _job_from_id(job_id):
+    """
+    Status of a job queued by another worker, derived from the stored forecast. Until
+    the forecast is stored it reads as running, and after JOB_TTL as unknown.
+    """
+    try:
+        head, horizon, symbol = job_id.split("-", 2)
+        created_at = int(head[:8], 16)
+        horizon = int(horizon)
+    except ValueError:
+        return None
+    if not symbol or time.time() - created_at > JOB_TTL:
+        return None
+
+    job = _new_job(job_id, symbol, created_at)
+    forecast = get_cached_forecast(symbol, None)
+    if forecast is None:
+        job["status"] = "running"
+    else:
+        job.update({"status": "done", "prediction": forecast[0], "forecast": forecast[:horizon]})
+    return job
+
+
+def _prune():
+    now = time.time()
+    expired = [
+        job_id for job_id, job in _jobs.items()
+        if job["finished_at"] is not None and now - job["finished_at"] > JOB_TTL
+    ]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def _run(job_id):
+    with _lock:
+        job = _jobs[job_id]
+        job["status"] = "running"
+        symbol = job["symbol"]
+
+    try:
+        forecast = get_forecast(symbol, PREDICTION_HORIZON)
+        update = {"status": "done", "prediction": forecast[0], "forecast": forecast}
+    except Exception as e:
+        print(f"[ERROR] Prediction job {job_id} for {symbol} failed: {e}")
+        update = {"status": "failed", "error": str(e)}
+
+    with _lock:
+        job.update(update)
+        job["finished_at"] = time.time()
+        _active.pop(symbol, None)
+
+
+def submit_prediction(symbol: str) -> dict:
+    """Queue a train/predict job for `symbol`, reusing the one already queued or running."""
+    symbol = symbol.upper().strip()
+
+    with _lock:
+        _prune()
+        job_id = _active.get(symbol)
+        if job_id is not None:
+            return dict(_jobs[job_id])
+
+        created_at = time.time()
+        job_id = _make_job_id(symbol, created_at)
+        _jobs[job_id] = _new_job(job_id, symbol, created_at)
+        _active[symbol] = job_id
+        job = dict(_jobs[job_id])
+
+    _executor.submit(_run, job_id)
+    return job
+
+
+def get_job(job_id: str):
+    with _lock:
+        job = _jobs.get(job_id)
+        if job is not None:
+            return dict(job)
+    # Queued by another worker, its result ends up in the shared Symbols table
+    return _job_from_id(job_id)
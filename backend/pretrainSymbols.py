@@ -0,0 +1,54 @@
+import os
+import sys
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from predictStock import train_symbol, predict_symbol, get_stale_symbols, save_predictions
+from popularSymbols import popular_symbols
+
+# How many symbols are trained on the model Space at the same time
+PRETRAIN_WORKERS = int(os.getenv("PRETRAIN_WORKERS", 3))
+# Write results to MySQL every this many finished symbols
+PRETRAIN_BATCH_SIZE = int(os.getenv("PRETRAIN_BATCH_SIZE", 20))
+
+
+def pretrain_symbol(symbol):
+    train_symbol(symbol)
+    trained_at = datetime.now()
+    return (symbol, trained_at, predict_symbol(symbol))
+
+
+def pretrain_all(symbols=None, max_workers=PRETRAIN_WORKERS):
+    """
+    Train and predict every tracked symbol that has no prediction from today,
+    so daytime requests hit the stored prediction.
+    """
+    symbols = get_stale_symbols(popular_symbols if symbols is None else symbols)
+    print(f"Pre-training {len(symbols)} symbols with {max_workers} workers")
+
+    pending = []
+    failed = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(pretrain_symbol, symbol): symbol for symbol in symbols}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                pending.append(future.result())
+                print(f"Predicted {symbol}")
+            except Exception as e:
+                print(f"[ERROR] Pre-training {symbol} failed: {e}")
+                failed.append(symbol)
+                continue
+
+            if len(pending) >= PRETRAIN_BATCH_SIZE:
+                save_predictions(pending)
+                pending = []
+
+    save_predictions(pending)
+    print(f"Done, {len(symbols) - len(failed)} predicted, {len(failed)} failed")
+    return failed
+
+
+if (__name__ == "__main__"):
+    failed = pretrain_all(sys.argv[1:] or None)
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,94 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import yfinance as yf
+from singleFlight import SingleFlight
+from lruCache import LRUCache
+
+# `.info` is one upstream call whatever fields are read from it, so the whole
+# blob shares one TTL, short enough for prices
+TTL = int(os.getenv("QUOTE_CACHE_TTL", 15))
+MAX_SIZE = int(os.getenv("QUOTE_CACHE_SIZE", 512))
+BULK_WORKERS = int(os.getenv("QUOTE_CACHE_BULK_WORKERS", 8))
+
+
+class QuoteCache:
+    """LRU cache of yfinance `Ticker.info` blobs, keyed by symbol."""
+
+    def __init__(self, max_size=MAX_SIZE, ttl=TTL):
+        self._cache = LRUCache(max_size, ttl)
+        # Concurrent misses for one symbol share a single upstream fetch
+        self._flights = SingleFlight()
+
+    def lookup(self, symbol):
+        """Return the cached info if it is younger than the TTL, else None."""
+        return self._cache.get(symbol.upper().strip())
+
+    def put(self, symbol, info):
+        self._cache.put(symbol.upper().strip(), info)
+
+    def _fetch(self, symbol, ticker=None):
+        def fetch():
+            info = (ticker or yf.Ticker(symbol)).info or {}
+            # Don't cache empty lookups, they are usually transient upstream failures
+            if info:
+                self.put(symbol, info)
+            return info
+        return self._flights.do(symbol, fetch)
+
+    def get(self, symbol):
+        """Return `Ticker.info` for `symbol`, fetching it only when the cached copy has expired."""
+        info = self.lookup(symbol)
+        if info is not None:
+            return info
+        return self._fetch(symbol.upper().strip())
+
+    def get_many(self, symbols):
+        """
+        Return {symbol: info or exception} for every symbol. Cached symbols are
+        served directly, the misses are fetched together in one bulk pass.
+        """
+        symbols = list(dict.fromkeys(s.upper().strip() for s in symbols if s and s.strip()))
+        results = {}
+        missing = []
+
+        for symbol in symbols:
+            info = self.lookup(symbol)
+            if info is not None:
+                results[symbol] = info
+            else:
+                missing.append(symbol)
+
+        if not missing:
+            return results
+
+        # yfinance has no bulk `.info` call, so share one Tickers object and
+        # fetch the individual quote blobs concurrently
+        tickers = yf.Tickers(" ".join(missing)).tickers
+
+        def fetch(symbol):
+            try:
+                return self._fetch(symbol, tickers[symbol])
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(BULK_WORKERS, len(missing))) as pool:
+            results.update(zip(missing, pool.map(fetch, missing)))
+
+        return results
+
+    def invalidate(self, symbol=None):
+        self._cache.invalidate(symbol.upper().strip() if symbol is not None else None)
+
+    def stats(self):
+        return self._cache.stats()
+
+
+quote_cache = QuoteCache()
+
+
+def get_info(symbol):
+    return quote_cache.get(symbol)
+
+
+def get_info_many(symbols):
+    return quote_cache.get_many(symbols)
@@ -0,0 +1,71 @@
+import os
+import time
+import hashlib
+from functools import wraps
+from flask import request, make_response, current_app
+from lruCache import LRUCache
+
+MAX_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", 1024))
+
+# Seconds each read endpoint may be served from cache (server-side and by browsers/CDNs)
+ROUTE_TTLS = {
+    "stockdata": int(os.getenv("STOCKDATA_CACHE_TTL", 15)),
+    "stockgraph": int(os.getenv("STOCKGRAPH_CACHE_TTL", 60)),
+    "stocksentiment": int(os.getenv("STOCKSENTIMENT_CACHE_TTL", 600)),
+    "popularstocks": int(os.getenv("POPULARSTOCKS_CACHE_TTL", 30)),
+    "marketstatus": int(os.getenv("MARKETSTATUS_CACHE_TTL", 10)),
+}
+
+
+# Rendered JSON responses keyed by route and request parameters, as (body, etag)
+response_cache = LRUCache(MAX_SIZE)
+
+
+def _cache_key():
+    # Query string and form body are treated alike, symbols are case-insensitive
+    params = tuple(sorted(
+        (name, value.strip().upper() if name == "stock_symbol" else value)
+        for name, value in request.values.items(multi=True)
+    ))
+    return (request.path, params)
+
+
+def _conditional(body, etag, ttl, age=0):
+    response = make_response(body)
+    response.mimetype = "application/json"
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = f"public, max-age={max(0, ttl - int(age))}"
+    return response.make_conditional(request)
+
+
+def cached_route(ttl, cacheable=None):
+    """
+    Memoize a JSON view for `ttl` seconds and add ETag/Cache-Control headers, answering
+    304 when the client already has the current body. Errors are never cached, nor
+    payloads for which `cacheable(payload)` is false.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = _cache_key()
+            entry = response_cache.get_entry(key, ttl)
+            if entry is not None:
+                stored_at, (body, etag) = entry
+                return _conditional(body, etag, ttl, time.time() - stored_at)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or not response.is_json:
+                return response
+            payload = response.get_json(silent=True)
+            if isinstance(payload, dict) and "error" in payload:
+                return response
+            if cacheable is not None and not cacheable(payload):
+                response.headers["Cache-Control"] = "no-cache"
+                return response
+
+            body = response.get_data()
+            etag = hashlib.sha1(body).hexdigest()
+            response_cache.put(key, (body, etag))
+            return _conditional(body, etag, ttl)
+        return wrapper
+    return decorator
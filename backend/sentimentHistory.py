@@ -0,0 +1,173 @@
+import os
+import re
+from datetime import date, datetime, timedelta
+from dbConnection import db_connection
+
+# Monthly Sentiment_History partitions kept ahead of the current month
+PARTITION_MONTHS_AHEAD = int(os.getenv("SENTIMENT_PARTITION_MONTHS_AHEAD", 3))
+# Longest window get_sentiment_history serves
+MAX_HISTORY_DAYS = int(os.getenv("MAX_SENTIMENT_HISTORY_DAYS", 365))
+
+
+def record_sentiments(rows, recorded_at=None):
+    """
+    Append (symbol, sentiment, price) rows to Sentiment_History and fold them into
+    the Sentiment_Daily aggregates.
+    """
+    if not rows:
+        return
+    recorded_at = recorded_at or datetime.now()
+    day = recorded_at.date()
+
+    with db_connection() as conn, conn.cursor() as cursor:
+        cursor.executemany(
+            """
+            INSERT INTO Sentiment_History (day, symbol, recorded_at, sentiment, price)
+            VALUES (%s, %s, %s, %s, %s)
+            """,
+            [(day, symbol, recorded_at, sentiment, price) for symbol, sentiment, price in rows]
+        )
+        # MySQL applies the assignments left to right, so the average uses the old sample count
+        cursor.executemany(
+            """
+            INSERT INTO Sentiment_Daily
+                (symbol, day, samples, avg_sentiment, min_sentiment, max_sentiment, last_sentiment, last_price)
+            VALUES (%s, %s, 1, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                avg_sentiment = (avg_sentiment * samples + VALUES(avg_sentiment)) / (samples + 1),
+                samples = samples + 1,
+                min_sentiment = LEAST(min_sentiment, VALUES(min_sentiment)),
+                max_sentiment = GREATEST(max_sentiment, VALUES(max_sentiment)),
+                last_sentiment = VALUES(last_sentiment),
+                last_price = VALUES(last_price)
+            """,
+            [
+                (symbol, day, sentiment, sentiment, sentiment, sentiment, price)
+                for symbol, sentiment, price in rows
+            ]
+        )
+        conn.commit()
+
+
+def get_previous_sentiments(before=None):
+    """Each symbol's last recorded sentiment on the most recent day before `before` (default today)."""
+    before = before or date.today()
+    with db_connection() as conn, conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT d.symbol, d.last_sentiment
+            FROM Sentiment_Daily d
+            JOIN (
+                SELECT symbol, MAX(day) AS day
+                FROM Sentiment_Daily
+                WHERE day < %s
+                GROUP BY symbol
+            ) prev ON prev.symbol = d.symbol AND prev.day = d.day
+            """,
+            (before,)
+        )
+        return {symbol: int(sentiment) for symbol, sentiment in cursor.fetchall()}
+
+
+def get_sentiment_history(symbol: str, days: int = 30):
+    """
+    Daily sentiment series for the last `days` days, with the change in average
+    sentiment (and price) between the first and last day of the window.
+    """
+    if not 1 <= days <= MAX_HISTORY_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_HISTORY_DAYS}")
+
+    symbol = symbol.upper().strip()
+    since = date.today() - timedelta(days=days)
+
+    with db_connection() as conn, conn.cursor(dictionary=True) as cursor:
+        cursor.execute(
+            """
+            SELECT day, samples, avg_sentiment, min_sentiment, max_sentiment, last_sentiment, last_price
+            FROM Sentiment_Daily
+            WHERE symbol = %s AND day >= %s
+            ORDER BY day
+            """,
+            (symbol, since)
+        )
+        rows = cursor.fetchall()
+
+    series = [
+        {
+            "date": row["day"].isoformat(),
+            "sentiment": round(float(row["avg_sentiment"]), 1),
+            "min": int(row["min_sentiment"]),
+            "max": int(row["max_sentiment"]),
+            "last": int(row["last_sentiment"]),
+            "price": float(row["last_price"]) if row["last_price"] is not None else None,
+            "samples": int(row["samples"]),
+        }
+        for row in rows
+    ]
+
+    change = None
+    price_change = None
+    if len(series) >= 2:
+        change = round(series[-1]["sentiment"] - series[0]["sentiment"], 1)
+        if series[0]["price"] and series[-1]["price"] is not None:
+            price_change = round((series[-1]["price"] - series[0]["price"]) / series[0]["price"] * 100, 2)
+
+    return {
+        "symbol": symbol,
+        "days": days,
+        "series": series,
+        "sentiment_change": change,
+        "price_change_pct": price_change
+    }
+
+
+def _next_month(year, month):
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def roll_partitions(months_ahead=PARTITION_MONTHS_AHEAD, today=None):
+    """
+    Split p_future so Sentiment_History has a monthly partition (pYYYYMM) for every
+    month up to `months_ahead` months from now. Returns the names of the new partitions.
+    """
+    today = today or date.today()
+
+    with db_connection() as conn, conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT PARTITION_NAME
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Sentiment_History'
+            """
+        )
+        months = [
+            (int(name[1:5]), int(name[5:7]))
+            for (name,) in cursor.fetchall()
+            if name and re.fullmatch(r"p\d{6}", name)
+        ]
+
+        # p_future can only be split above the highest existing bound
+        year, month = _next_month(*max(months)) if months else (today.year, today.month)
+        last = (today.year, today.month)
+        for _ in range(months_ahead):
+            last = _next_month(*last)
+
+        added = []
+        definitions = []
+        while (year, month) <= last:
+            upper = _next_month(year, month)
+            added.append(f"p{year}{month:02d}")
+            definitions.append(f"PARTITION {added[-1]} VALUES LESS THAN ('{upper[0]}-{upper[1]:02d}-01')")
+            year, month = upper
+
+        if definitions:
+            cursor.execute(
+                "ALTER TABLE Sentiment_History REORGANIZE PARTITION p_future INTO ("
+                + ", ".join(definitions)
+                + ", PARTITION p_future VALUES LESS THAN (MAXVALUE))"
+            )
+        return added
+
+
+if (__name__ == "__main__"):
+    print("Added partitions:", roll_partitions() or "none")
@@ -1,49 +1,161 @@
+import os
 from datetime import datetime, timedelta
-import yfinance as yf
-from predictStock import train_or_predict
+import pandas as pd
+from predictStock import get_forecast, get_cached_forecast
+from predictionJobs import submit_prediction
+from quoteCache import get_info
+from historyStore import get_history
+from downsample import lttb_series, resample_ohlc
+from intradayHistory import get_intraday_closes, INTRADAY_INTERVALS
+
+
+# Trading days shown by default, the calendar days in between are filled with null
+TRADING_DAYS = 6
+
+# Chart range -> calendar days of history
+CHART_RANGES = {
+    "1w": 7,
+    "1m": 31,
+    "3m": 92,
+    "1y": 365,
+    "5y": 1827,
+}
+# Chart interval -> resample rule applied to the daily bars
+CHART_INTERVALS = {
+    "1d": None,
+    "1wk": "W-FRI",
+    "1mo": "ME",
+}
+# Ranged charts are downsampled to at most this many points
+MAX_POINTS = int(os.getenv("GRAPH_MAX_POINTS", 200))
+
+
+def align_to_calendar(closes: pd.Series, end, trading_days: int = None, lookback_days: int = None) -> pd.Series:
+    """
+    Reindex daily closes onto every calendar day up to `end`. The window starts
+    `lookback_days` before `end`, or at the `trading_days`-th most recent trading
+    day (as far back as the data goes when there are fewer). Days without a bar are NaN.
+    """
+    closes = closes.dropna()
+    index = pd.DatetimeIndex(closes.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    closes = pd.Series(closes.to_numpy(dtype=float), index=index.normalize())
+    closes = closes[~closes.index.duplicated(keep="last")]
+
+    end = pd.Timestamp(end)
+    closes = closes[closes.index <= end]
+
+    if lookback_days is not None:
+        start = end - pd.Timedelta(days=lookback_days)
+    elif trading_days is not None and not closes.empty:
+        start = closes.index[-min(trading_days, len(closes))]
+    else:
+        start = closes.index[0] if not closes.empty else end
+
+    return closes.reindex(pd.date_range(start, end, freq="D")).round(2)
+
+
+def get_range_closes(ticker: str, chart_range: str, interval: str = "1d", max_points: int = MAX_POINTS, today=None) -> pd.Series:
+    """Closing prices over `chart_range` at `interval`, downsampled to `max_points` with LTTB."""
+    if chart_range not in CHART_RANGES:
+        raise ValueError(f"range must be one of {', '.join(CHART_RANGES)}")
+    if interval not in CHART_INTERVALS:
+        raise ValueError(f"interval must be one of {', '.join(CHART_INTERVALS)}")
+
+    today = today or datetime.utcnow().date()
+    hist = get_history(ticker, today - timedelta(days=CHART_RANGES[chart_range]), today)
+
+    rule = CHART_INTERVALS[interval]
+    if rule is not None and not hist.empty:
+        hist = resample_ohlc(hist, rule)
+
+    return lttb_series(hist["Close"].round(2), max_points)
+
+
+def get_intraday_data(ticker: str, interval: str, max_points: int = MAX_POINTS) -> dict:
+    """{ISO timestamp: close} of the shared intraday buffer for `ticker`, no predictions."""
+    closes = lttb_series(get_intraday_closes(ticker, interval), max_points)
+    return dict(zip((ts.isoformat() for ts in closes.index), closes.tolist()))
+
+
+def to_price_map(closes: pd.Series) -> dict:
+    """{ISO date: price or None} from a date-indexed series."""
+    prices = closes.astype(object).where(closes.notna(), None)
+    return dict(zip(closes.index.strftime("%Y-%m-%d"), prices.tolist()))
+
+
+def forecast_dates(days: int, today=None) -> list:
+    """The `days` trading days after `today`, as ISO dates."""
+    today = today or datetime.utcnow().date()
+    return [
+        day.date().isoformat()
+        for day in pd.bdate_range(today + timedelta(days=1), periods=days)
+    ]
+
+
+def forecast_points(forecast, today=None) -> dict:
+    """Map a forecast vector onto the trading days after `today`."""
+    return {
+        day: round(prediction, 2)
+        for day, prediction in zip(forecast_dates(len(forecast), today), forecast)
+    }
+
 
+def get_prediction_points(ticker: str, days: int = 1) -> dict:
+    """
+    Returns {"status": "ready", "points": {date: price}} from the stored forecast, or
+    {"status": "pending", "job_id": ...} after queueing the model run.
+    """
+    forecast = get_cached_forecast(ticker, days)
+    if forecast is not None:
+        return {"status": "ready", "points": forecast_points(forecast)}
+
+    job = submit_prediction(ticker)
+    return {"status": "pending", "job_id": job["job_id"]}
+
+
+def get_graph_data(ticker: str, days: int = 1, wait_for_prediction: bool = True, lookback_days: int = None,
+                   chart_range: str = None, interval: str = "1d", max_points: int = MAX_POINTS) -> dict:
+    """
+    Closing prices by date (the last TRADING_DAYS trading days, every day of the
+    last `lookback_days`, or the trading days of `chart_range` at `interval`),
+    followed by the predicted prices. Intraday intervals (1m, 5m) return the
+    session's bars by timestamp instead. With
+    `wait_for_prediction=False` the predicted dates are null until the model has
+    run, fetch them with get_prediction_points.
+    """
+    if max_points < 3:
+        # LTTB always keeps the first and last point and needs at least one bucket between
+        raise ValueError("max_points must be at least 3")
+
+    if interval in INTRADAY_INTERVALS:
+        return get_intraday_data(ticker, interval, max_points)
+    if interval not in CHART_INTERVALS:
+        raise ValueError(f"interval must be one of {', '.join([*CHART_INTERVALS, *INTRADAY_INTERVALS])}")
+    if chart_range is None and interval != "1d":
+        raise ValueError(f"interval {interval} needs a range ({', '.join(CHART_RANGES)})")
 
-def get_graph_data(ticker: str) -> dict:
     today = datetime.utcnow().date()
     today_str = today.isoformat()
 
-    stock = yf.Ticker(ticker)
-
-    # Pull extra history to handle weekends/holidays
-    hist = stock.history(period="30d", interval="1d")
-
-    # Convert historical data to date -> close
-    hist_map = {
-        d.date(): round(float(row["Close"]), 2)
-        for d, row in hist.iterrows()
-        if row["Close"] is not None
-    }
-
-    if not hist_map:
+    if chart_range is not None:
+        closes = get_range_closes(ticker, chart_range, interval, max_points, today)
+    elif lookback_days is None:
+        # Pull extra history to handle weekends/holidays, served from the local store
+        hist = get_history(ticker, today - timedelta(days=30), today)
+        closes = align_to_calendar(hist["Close"], today, trading_days=TRADING_DAYS)
+    else:
+        hist = get_history(ticker, today - timedelta(days=lookback_days), today)
+        closes = align_to_calendar(hist["Close"], today, lookback_days=lookback_days)
+
+    if closes.isna().all():
         raise ValueError("No historical data available")
 
-    # Walk backwards day-by-day until we collect 8 valid trading days
-    valid_days = 0
-    cursor = today
-
-    while valid_days < 6:
-        if cursor in hist_map:
-            valid_days += 1
-        cursor -= timedelta(days=1)
-
-    # cursor is now one day BEFORE the start
-    start_date = cursor + timedelta(days=1)
-
-    result = {}
-
-    # Fill ALL calendar days between start_date and today
-    current_date = start_date
-    while current_date <= today:
-        result[current_date.isoformat()] = hist_map.get(current_date)
-        current_date += timedelta(days=1)
+    result = to_price_map(closes)
 
     # Get current price (overwrite today's value)
-    info = stock.info
+    info = get_info(ticker)
     current_price = (
         info.get("regularMarketPrice")
         or info.get("currentPrice")
@@ -55,9 +167,16 @@ def get_graph_data(ticker: str) -> dict:
 
     result[today_str] = round(float(current_price), 2)
 
-    # Predict tomorrow
-    tomorrow = today + timedelta(days=1)
-    prediction = train_or_predict(ticker)
-    result[tomorrow.isoformat()] = round(prediction, 2)
+    # Predict the next `days` trading days
+    if wait_for_prediction:
+        result.update(forecast_points(get_forecast(ticker, days), today))
+    else:
+        forecast = get_cached_forecast(ticker, days)
+        if forecast is None:
+            # Mark the points as pending and start the model run in the background
+            submit_prediction(ticker)
+            result.update(dict.fromkeys(forecast_dates(days, today)))
+        else:
+            result.update(forecast_points(forecast, today))
 
     return result
@@ -1,13 +1,20 @@
 import os
 import nltk
 import praw
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from nltk.sentiment import SentimentIntensityAnalyzer
 from dotenv import load_dotenv
 import itertools
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from abc import ABC, abstractmethod
+from quoteCache import get_info
+from postStore import post_store
+from lruCache import LRUCache
 
 # --- Load environment variables ---
 load_dotenv()
@@ -23,8 +30,7 @@ nltk.download('vader_lexicon', quiet=True)
 class StockInfo:
     def symbol_exists(self, symbol):
         try:
-            ticker = yf.Ticker(symbol)
-            price = ticker.info.get("currentPrice")
+            price = get_info(symbol).get("currentPrice")
             return price is not None
         except Exception as e:
             raise RuntimeError(f"Stock symbol '{symbol}' lookup failed: {e}") from e
@@ -40,21 +46,55 @@ class DataFetcher(ABC):
         pass
 
 # --- Reddit Fetcher ---
-class RedditPostData(DataFetcher):
-    def __init__(self):
+# praw.Reddit isn't thread-safe, so every worker thread lazily creates one
+# client and keeps reusing it for the lifetime of the process
+_reddit_local = threading.local()
+
+def get_reddit():
+    reddit = getattr(_reddit_local, "reddit", None)
+    if reddit is None:
         try:
-            self.reddit = praw.Reddit(
+            reddit = praw.Reddit(
                 client_id=os.getenv('REDDIT_CLIENT_ID'),
                 client_secret=os.getenv('REDDIT_CLIENT_SECRET'),
                 user_agent=os.getenv('REDDIT_USER_AGENT')
             )
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Reddit client: {e}") from e
+        _reddit_local.reddit = reddit
+    return reddit
+
+
+# Search windows, narrowest first, and how far back (seconds) each one reaches
+SEARCH_PERIODS = {
+    "day": 86400,
+    "week": 7 * 86400,
+    "month": 31 * 86400,
+    "year": 366 * 86400,
+}
+MIN_POSTS = 2
+MAX_POSTS = int(os.getenv("SENTIMENT_MAX_POSTS", 100))
+# Stored posts are considered current for this long (seconds) before asking Reddit for newer ones
+POST_SYNC_INTERVAL = int(os.getenv("POST_SYNC_INTERVAL", 900))
+# Search all windows at once during a backfill instead of widening one at a time
+PARALLEL_SEARCH = os.getenv("REDDIT_PARALLEL_SEARCH", "1") == "1"
+# Long-lived so each search thread keeps reusing its own Reddit client
+_search_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("REDDIT_SEARCH_WORKERS", 8)),
+    thread_name_prefix="reddit-search"
+)
 
-    def fetch_data(self, stock: str, time_period: str):
+
+class RedditPostData(DataFetcher):
+    def __init__(self, store=None, parallel=None):
+        self.store = post_store if store is None else store
+        self.parallel = PARALLEL_SEARCH if parallel is None else parallel
+
+    def fetch_data(self, stock: str, time_period: str, sort: str = "hot"):
         try:
-            listing = self.reddit.subreddit("stocks+investing+wallstreetbets").search(
-                f"{stock} stock", limit=100, sort="hot", time_filter=time_period
+            # Resolved per call, the search may run on a pool thread
+            listing = get_reddit().subreddit("stocks+investing+wallstreetbets").search(
+                f"{stock} stock", limit=100, sort=sort, time_filter=time_period
             )
             first_item = next(listing, None)
             if first_item is None:
@@ -63,59 +103,224 @@ class RedditPostData(DataFetcher):
         except Exception as e:
             raise RuntimeError(f"Failed to fetch submissions for {stock} ({time_period}): {e}") from e
 
-    def data_to_DF(self, stock_symbol: str) -> pd.DataFrame:
+    def collect_posts(self, stock: str, time_period: str, sort: str = "hot", newer_than=None):
+        """Fetch a window of submissions as post dicts, optionally stopping at `newer_than`."""
         posts = []
-        print("Starting to extract posts...")
+        submissions = self.fetch_data(stock, time_period, sort)
+        if not submissions:
+            return posts
+
+        for post in submissions:
+            try:
+                created_utc = getattr(post, "created_utc", None)
+                if newer_than is not None and created_utc is not None and created_utc <= newer_than:
+                    # Results are sorted newest first, everything after this is already stored
+                    break
+                posts.append({
+                    "id": post.id,
+                    "title": getattr(post, "title", "") or "",
+                    "text": getattr(post, "selftext", "") or "",
+                    "score": getattr(post, "score", 0) or 0,
+                    "created_utc": created_utc
+                })
+            except Exception:
+                # Skip malformed posts but continue processing others
+                continue
+
+        return posts
+
+    def backfill(self, stock_symbol: str):
+        """First sync of a symbol: widen the window until enough posts are found."""
+        if self.parallel:
+            return self._backfill_parallel(stock_symbol)
 
-        for period in ["day", "week", "month", "year"]:
+        posts = []
+        for period in SEARCH_PERIODS:
             print(f"Extracting posts for: {period}")
-            submissions = self.fetch_data(stock_symbol, period)
-            if submissions:
-                for post in submissions:
-                    try:
-                        posts.append({
-                            "title": getattr(post, "title", "") or "",
-                            "text": getattr(post, "selftext", "") or "",
-                            "score": getattr(post, "score", 0) or 0,
-                            "created_utc": getattr(post, "created_utc", None)
-                        })
-                    except Exception:
-                        # Skip malformed posts but continue processing others
-                        continue
-
-                    # Stop fetching if we have at least 2 posts
-                    if len(posts) >= 2:
-                        break
-
-                if len(posts) >= 2:
+            posts = self.collect_posts(stock_symbol, period)
+            if len(posts) >= MIN_POSTS:
+                break
+            print("Resuming search with a larger period...")
+        return posts
+
+    def _backfill_parallel(self, stock_symbol: str):
+        """Search every window concurrently and keep the narrowest one with enough posts."""
+        print(f"Extracting posts for: {', '.join(SEARCH_PERIODS)}")
+        futures = [
+            _search_pool.submit(self.collect_posts, stock_symbol, period)
+            for period in SEARCH_PERIODS
+        ]
+
+        posts = []
+        try:
+            for future in futures:
+                posts = future.result()
+                if len(posts) >= MIN_POSTS:
                     break
-            else:
-                print("Resuming search with a larger period...")
+        finally:
+            # Wider searches that haven't started yet are no longer needed
+            for future in futures:
+                future.cancel()
+
+        return posts
+
+    def refresh_scores(self, stock_symbol: str):
+        """
+        Re-read the upvotes of the stored posts that can still be scored. Posts found
+        through sort=new are saved minutes after submission, with a score near zero.
+        """
+        posts = self.store.get_posts(
+            stock_symbol,
+            since_utc=time.time() - max(SEARCH_PERIODS.values()),
+            limit=MAX_POSTS
+        )
+        if not posts:
+            return
+
+        # praw batches the fullnames into requests of 100
+        submissions = get_reddit().info(fullnames=[f"t3_{p['id']}" for p in posts])
+        scores = {post.id: getattr(post, "score", 0) or 0 for post in submissions}
+        self.store.update_scores(stock_symbol, scores)
+
+    def sync(self, stock_symbol: str):
+        """Store any submissions newer than the last one seen for this symbol."""
+        last_synced, last_seen = self.store.get_sync_state(stock_symbol)
+        now = time.time()
+        if last_synced is not None and now - last_synced < POST_SYNC_INTERVAL:
+            return
+
+        if last_seen is None:
+            posts = self.backfill(stock_symbol)
+        else:
+            # Narrowest search window that still reaches back to the last seen post
+            period = next(
+                (p for p, seconds in SEARCH_PERIODS.items() if now - last_seen <= seconds),
+                "all"
+            )
+            print(f"Extracting new posts for: {period}")
+            posts = self.collect_posts(stock_symbol, period, sort="new", newer_than=last_seen)
+            self.refresh_scores(stock_symbol)
 
-        if len(posts) < 2:
-            raise RuntimeError(f"Insufficient Reddit posts found for '{stock_symbol}'. At least 2 posts are required.")
+        self.store.save_posts(stock_symbol, posts)
+        seen = [p["created_utc"] for p in posts if p["created_utc"] is not None]
+        self.store.mark_synced(stock_symbol, max(seen) if seen else None)
+
+    def data_to_DF(self, stock_symbol: str) -> pd.DataFrame:
+        print("Starting to extract posts...")
+        sync_error = None
+        try:
+            self.sync(stock_symbol)
+        except Exception as e:
+            sync_error = e
+            # Reddit being down shouldn't fail the request while stored posts can still be scored
+            print(f"[ERROR] Reddit sync for {stock_symbol} failed, using stored posts: {e}")
+
+        # Score the narrowest window that has enough stored posts
+        posts = []
+        now = time.time()
+        for seconds in SEARCH_PERIODS.values():
+            posts = self.store.get_posts(stock_symbol, since_utc=now - seconds, limit=MAX_POSTS)
+            if len(posts) >= MIN_POSTS:
+                break
+
+        if len(posts) < MIN_POSTS:
+            if sync_error is not None:
+                raise sync_error
+            raise RuntimeError(f"Insufficient Reddit posts found for '{stock_symbol}'. At least {MIN_POSTS} posts are required.")
 
         return pd.DataFrame(posts)
 
 # --- Sentiment Analysis ---
+# extend lexicon, examples
+CUSTOM_LEXICON = {
+    'bagholder': -3.0,
+    'scam': -4.0,
+    'overvalued': -2.5,
+    'undervalued': 2.5,
+    'moon': 3.0,
+    'rekt': -3.5
+}
+
+# Changes whenever the lexicon does, so cached scores from an older lexicon are never reused
+LEXICON_VERSION = hashlib.sha1(
+    f"{nltk.__version__}:{json.dumps(CUSTOM_LEXICON, sort_keys=True)}".encode()
+).hexdigest()[:12]
+SCORE_CACHE_SIZE = int(os.getenv("SCORE_CACHE_SIZE", 50000))
+
+
+def _create_analyzer():
+    try:
+        sia = SentimentIntensityAnalyzer()
+    except Exception as e:
+        raise RuntimeError(f"Failed to initialize SentimentIntensityAnalyzer: {e}") from e
+    sia.lexicon.update(CUSTOM_LEXICON)
+    return sia
+
+
+# One analyzer per process, the lexicon is only loaded and extended once.
+# polarity_scores only reads the lexicon so the instance is safe to share.
+_shared_sia = None
+_shared_sia_lock = threading.Lock()
+
+def get_analyzer():
+    global _shared_sia
+    if _shared_sia is None:
+        with _shared_sia_lock:
+            if _shared_sia is None:
+                _shared_sia = _create_analyzer()
+    return _shared_sia
+
+
+# --- Score Cache ---
+class ScoreCache(LRUCache):
+    """LRU of per-post sentiment scores, keyed by a hash of the post content."""
+
+    def __init__(self, max_size=SCORE_CACHE_SIZE):
+        super().__init__(max_size)
+
+    @staticmethod
+    def key(title, text):
+        content = f"{LEXICON_VERSION}\0{title}\0{text}"
+        return hashlib.sha1(content.encode("utf-8", "replace")).hexdigest()
+
+
+score_cache = ScoreCache()
+
+
 class SentimentAnalysis:
     def __init__(self):
-        try:
-            self.sia = SentimentIntensityAnalyzer()
-        except Exception as e:
-            raise RuntimeError(f"Failed to initialize SentimentIntensityAnalyzer: {e}") from e
-
+        self.sia = get_analyzer()
         self.last_df = None
+        self.last_sentiment = None
+        self.last_upvotes = None
+
+    # ---- Batched Scoring ----
+    def score_texts(self, texts) -> np.ndarray:
+        """Compound VADER score for every text, each distinct text scored once."""
+        texts = ["" if t is None else str(t) for t in texts]
+        unique_texts = list(dict.fromkeys(texts))
+
+        scores = [self.sia.polarity_scores(text)['compound'] for text in unique_texts]
+
+        lookup = dict(zip(unique_texts, scores))
+        return np.fromiter((lookup[text] for text in texts), dtype=float, count=len(texts))
+
+    def score_posts(self, titles, texts) -> np.ndarray:
+        """Per-post sentiment, titles weigh more than the body text. Only uncached posts are scored."""
+        titles = ["" if t is None else str(t) for t in titles]
+        texts = ["" if t is None else str(t) for t in texts]
+        keys = [score_cache.key(title, text) for title, text in zip(titles, texts)]
+        cached = score_cache.get_many(keys)
+
+        missing = [i for i, score in enumerate(cached) if score is None]
+        if missing:
+            scores = self.score_texts([titles[i] for i in missing] + [texts[i] for i in missing])
+            computed = (0.7 * scores[:len(missing)]) + (0.3 * scores[len(missing):])
+            score_cache.put_many((keys[i], float(score)) for i, score in zip(missing, computed))
+            for i, score in zip(missing, computed):
+                cached[i] = float(score)
 
-        # extend lexicon, examples
-        self.sia.lexicon.update({
-            'bagholder': -3.0,
-            'scam': -4.0,
-            'overvalued': -2.5,
-            'undervalued': 2.5,
-            'moon': 3.0,
-            'rekt': -3.5
-        })
+        return np.asarray(cached, dtype=float)
 
     # ---- Trend Score ----
     def predict_trend(self, posts_df):
@@ -131,43 +336,40 @@ class SentimentAnalysis:
         if posts_df.empty:
             return 0.0
 
-        def sentiment_row(row):
-            title_score = self.sia.polarity_scores(row['title'])['compound']
-            text_score = self.sia.polarity_scores(row['text'])['compound']
-            return (0.7 * title_score) + (0.3 * text_score)
+        sentiment = self.score_posts(posts_df['title'].tolist(), posts_df['text'].tolist())
+        upvotes = posts_df['score'].to_numpy(dtype=float)
+        weight = upvotes + 1 # avoid zero weight
 
-        posts_df['sentiment'] = posts_df.apply(sentiment_row, axis=1)
-        posts_df['weight'] = posts_df['score'] + 1 # avoid zero weight
+        total_weight = weight.sum()
+        trend = (np.dot(sentiment, weight) / total_weight) if total_weight != 0 else 0.0
 
-        weighted_sum = (posts_df['sentiment'] * posts_df['weight']).sum()
-        total_weight = posts_df['weight'].sum()
-        trend = (weighted_sum / total_weight) if total_weight != 0 else 0.0 
-
-        self.last_df = posts_df
-        return trend
+        self.last_sentiment = sentiment
+        self.last_upvotes = upvotes
+        self.last_df = posts_df.assign(sentiment=sentiment, weight=weight)
+        return float(trend)
 
     # ---- Confidence Score ----
     def confidence_score(self) -> float:
 
-        posts_df = self.last_df
-        if posts_df is None or posts_df.empty or 'sentiment' not in posts_df:
+        sentiment = self.last_sentiment
+        if sentiment is None or sentiment.size == 0:
             return 0.0
 
-        n = len(posts_df)
+        n = sentiment.size
 
         # volume confidence
         volume_score = min(1.0, np.log10(n + 1) / 2.3)
 
         # agreement confidence (variance)
-        variance = posts_df['sentiment'].var()
+        variance = sentiment.var(ddof=1) if n > 1 else np.nan
         agreement_score = 1 / (1 + variance * 5)
 
         # vote confidence
-        avg_upvotes = posts_df['score'].mean()
+        avg_upvotes = self.last_upvotes.mean()
         vote_score = min(1.0, np.log10(avg_upvotes + 1) / 2)
 
         # strength confidence
-        avg_sentiment = abs(posts_df['sentiment'].mean())
+        avg_sentiment = abs(sentiment.mean())
         strength_score = min(1.0, avg_sentiment * 1.5)
 
         confidence = (
@@ -179,6 +381,17 @@ class SentimentAnalysis:
 
         return float(round(confidence, 3))
 
+# --- Warm-up ---
+def warm_up():
+    """
+    Load the analyzer ahead of the first request. Reddit clients are per thread and
+    are created by whichever thread first searches.
+    """
+    try:
+        get_analyzer()
+    except Exception as e:
+        print(f"[ERROR] Sentiment warm-up failed: {e}")
+
 # --- Main API ---
 def get_stock_sentiment(stock_symbol: str):
     """
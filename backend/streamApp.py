@@ -0,0 +1,57 @@
+import os
+import threading
+from flask import Flask, Response, jsonify, stream_with_context
+from flask_cors import CORS
+from marketStatus import get_market_status
+from popularSymbols import get_popular_stocks, sync_leaderboard
+from backgroundRefresher import register_task, start_background_tasks, event_stream
+
+# Runs as its own single-worker process (see Procfile) so the refresher starts exactly
+# once and long-lived SSE connections never take threads from the API workers.
+# It listens on STREAM_PORT (default 5001), the proxy routes /stream/ here
+app = Flask(__name__)
+CORS(app)
+
+# Each subscriber holds one worker thread, keep this below GUNICORN_THREADS
+MAX_SUBSCRIBERS = int(os.getenv("STREAM_MAX_SUBSCRIBERS", 48))
+# Seconds clients over the cap should wait before polling again
+RETRY_AFTER = int(os.getenv("STREAM_RETRY_AFTER", 15))
+
+_subscribers = threading.BoundedSemaphore(MAX_SUBSCRIBERS)
+
+
+def refresh_popular_stocks():
+    # Picks up rows written by the sentiment refresher job
+    sync_leaderboard()
+    return get_popular_stocks()
+
+register_task("market_status", get_market_status, int(os.getenv("MARKET_REFRESH_INTERVAL", 15)))
+register_task("popular_stocks", refresh_popular_stocks, int(os.getenv("POPULAR_REFRESH_INTERVAL", 60)))
+start_background_tasks()
+
+
+def subscriber_stream():
+    try:
+        yield from event_stream()
+    finally:
+        _subscribers.release()
+
+@app.route("/healthz")
+def healthz():
+    return jsonify({"status": "ok"})
+
+@app.route("/stream/market", methods=["GET"])
+def streamMarket():
+    # Server-Sent-Events: pushes market status / popular stocks whenever they change
+    if not _subscribers.acquire(blocking=False):
+        # Full, the client falls back to polling /getmarketstatus and /getpopularstocks
+        response = jsonify({"error": "Too many stream subscribers, poll instead."})
+        response.status_code = 503
+        response.headers["Retry-After"] = str(RETRY_AFTER)
+        return response
+
+    return Response(
+        stream_with_context(subscriber_stream()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )